@@ -4,15 +4,46 @@ Created by akhi07rx with the fastf1 Python library
 """
 
 import argparse
+import csv
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import fastf1
 import pandas as pd
-import matplotlib.pyplot as plt
-from tabulate import tabulate
+import requests
 from datetime import datetime
+import glob
 import os
+import shlex
 import sys
 import time
 
+def save_csv(df, filename):
+    """Save a DataFrame to CSV, using pyarrow's writer when it is installed"""
+    # pyarrow is optional and slow to import, so only load it when exporting
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(filename, index=False)
+        return
+
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(
+            df, preserve_index=False), filename)
+    except pa.ArrowException:
+        # Columns pyarrow cannot convert fall back to pandas
+        df.to_csv(filename, index=False)
+
+
+def print_table(df, max_rows=40, headers='keys', tablefmt='grid'):
+    """Print a DataFrame with tabulate, or as plain text when it is too long"""
+    from tabulate import tabulate
+
+    if len(df) <= max_rows:
+        print(tabulate(df, headers=headers, tablefmt=tablefmt))
+    else:
+        print(df.to_string(index=False))
+
 
 def create_cache_directory():
     """Create cache directory if it doesn't exist"""
@@ -27,23 +58,268 @@ def create_cache_directory():
 cache_dir = create_cache_directory()
 fastf1.Cache.enable_cache(cache_dir)
 
+# Race results already parsed by fastf1 are kept here as pickles
+results_cache_dir = os.path.join(cache_dir, 'results')
+os.makedirs(results_cache_dir, exist_ok=True)
+
+# Number of race sessions loaded concurrently in season-wide loops
+MAX_WORKERS = 8
+
+# Number of fully loaded race sessions kept in memory per dashboard
+SESSION_CACHE_SIZE = 8
+
+# Result columns used by the season-wide statistics and stored on disk
+RESULT_COLUMNS = ['Abbreviation', 'FullName',
+                  'TeamName', 'Position', 'Points', 'Status']
+
+# Columns of the per-season results table built from those races
+SEASON_COLUMNS = ['Round'] + RESULT_COLUMNS
+
+# Statuses of classified finishers, lapped cars report "+N Lap(s)"
+FINISHED_STATUSES = {'Finished', 'Lapped'}
+LAPPED_STATUS_PATTERN = r'\+\d+ Laps?'
+
+
+def _finished(status):
+    """Mark which entries of a Status column are classified finishers"""
+    return status.isin(FINISHED_STATUSES) | status.str.fullmatch(
+        LAPPED_STATUS_PATTERN, na=False)
+
+
+@lru_cache(maxsize=64)
+def _load_schedule(year):
+    """Fetch the event schedule for a season once per process"""
+    return fastf1.get_event_schedule(year)
+
+
+def _load_session(year, round_num):
+    """Load a race session, returning None in place of the session on failure"""
+    try:
+        session = fastf1.get_session(year, round_num, 'R')
+        # Only results and laps are read, telemetry and weather are the slowest parts to load
+        session.load(telemetry=False, weather=False)
+        return year, round_num, session
+    except Exception as e:
+        print(f"Error processing {year} round {round_num}: {e}")
+        return year, round_num, None
+
+
+def _write_pickle(df, path):
+    """Pickle a DataFrame through a temporary file so readers never see a partial one"""
+    tmp_path = f"{path}.tmp"
+    df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=512)
+def _cached_results(year, round_num):
+    """Fetch the results of a race once per process, raising on failure"""
+    path = os.path.join(results_cache_dir,
+                        f"results_{year}_{round_num}.pkl")
+    if os.path.exists(path):
+        results = pd.read_pickle(path)
+    else:
+        session = fastf1.get_session(year, round_num, 'R')
+        session.load(laps=False, telemetry=False,
+                     weather=False, messages=False)
+
+        # Completed races do not change, so the results are kept for good,
+        # unless they are not published yet and have no positions
+        results = pd.DataFrame(session.results[RESULT_COLUMNS])
+        if results['Position'].notna().any():
+            _write_pickle(results, path)
+
+    return results
+
+
+def _load_results(year, round_num):
+    """Load the results of a race, returning None in place of the results on failure"""
+    try:
+        return year, round_num, _cached_results(year, round_num)
+    except Exception as e:
+        print(f"Error processing {year} round {round_num}: {e}")
+        return year, round_num, None
+
+
+# Kept at module level so it can run in a ProcessPoolExecutor worker
+def _summarize_race(year, round_num):
+    """Summarize one race as a row of the all-time export, or None on failure"""
+    _, _, session = _load_session(year, round_num)
+    if session is None:
+        return None
+
+    try:
+        # Winner info
+        winner = session.results.loc[session.results['Position'].idxmin()]
+
+        # Fastest lap
+        try:
+            fastest = session.laps.pick_fastest()
+            fastest_driver = fastest['Driver']
+            fastest_time = str(fastest['LapTime'])
+        except:
+            fastest_driver = 'N/A'
+            fastest_time = 'N/A'
+
+        return (year, round_num, session.event['EventName'],
+                session.event['EventDate'].strftime('%Y-%m-%d'),
+                session.event['CircuitName'],
+                session.event['Country'], winner['FullName'],
+                winner['TeamName'], fastest_driver, fastest_time)
+    except Exception as e:
+        print(f"Error processing {year} round {round_num}: {e}")
+        return None
+
 
 class F1Dashboard:
     def __init__(self):
         self.current_year = datetime.now().year
+        self._session_cache = {}
+        self._completed_rounds_cache = {}
+
+        # Single figure reused by every points chart, created on first use
+        self._fig = None
+        self._ax = None
+
+    def _load_all_results(self, year_rounds):
+        """Load race results concurrently, yielding (year, round, results) as each completes"""
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [executor.submit(_load_results, year, round_num)
+                       for year, round_num in year_rounds]
+            for future in as_completed(futures):
+                year, round_num, results = future.result()
+                if results is not None:
+                    yield year, round_num, results
+
+    def _load_seasons(self, years):
+        """Load one results table per season, keyed by year"""
+        season_rounds = self._completed_rounds_by_year(years)
+
+        # Finished seasons are read back from their stored table
+        seasons = {}
+        pending = []
+        for year, completed_rounds in season_rounds.items():
+            path = os.path.join(results_cache_dir, f"season_{year}.pkl")
+            if year < self.current_year and os.path.exists(path):
+                seasons[year] = pd.read_pickle(path)
+            else:
+                pending.extend((year, round_num)
+                               for round_num in completed_rounds)
+
+        # Load the missing rounds of every season in one pool
+        frames = {}
+        for year, round_num, results in self._load_all_results(pending):
+            frames.setdefault(year, []).append(results.assign(Round=round_num))
+
+        for year, completed_rounds in season_rounds.items():
+            if year in seasons:
+                continue
+
+            season_frames = frames.get(year, [])
+            if season_frames:
+                season = pd.concat(season_frames, ignore_index=True)[SEASON_COLUMNS].sort_values(
+                    'Round', kind='stable', ignore_index=True)
+            else:
+                # Numeric columns keep their types so statistics still run
+                season = pd.DataFrame(columns=SEASON_COLUMNS).astype(
+                    {'Round': int, 'Position': float, 'Points': float})
+
+            # Store finished seasons once every round has loaded
+            if year < self.current_year and len(season_frames) == len(completed_rounds):
+                _write_pickle(season, os.path.join(
+                    results_cache_dir, f"season_{year}.pkl"))
+            seasons[year] = season
+
+        # Finishing mask shared by every statistic working on a season
+        for season in seasons.values():
+            season['_finished'] = _finished(season['Status'])
+
+        return {year: seasons[year] for year in season_rounds}
+
+    def sync_local_store(self, start_year, end_year=None):
+        """Build the local results tables for a range of seasons"""
+        end_year = end_year or self.current_year
+
+        print(f"\n=== Syncing Race Results from {start_year} to {end_year} ===\n")
+        seasons = self._load_seasons(range(start_year, end_year + 1))
+        for year, season in seasons.items():
+            print(f"{year}: {season['Round'].nunique()} races")
+
+        return seasons
 
     def get_race_schedule(self, year=None):
         """Get and display the F1 race schedule for a given year"""
         year = year or self.current_year
         try:
-            race_schedule = fastf1.get_event_schedule(year)
+            race_schedule = _load_schedule(year)
             return race_schedule
         except Exception as e:
             print(f"Error getting race schedule for {year}: {e}")
             return None
 
+    def _completed_rounds(self, year, now_ts=None):
+        """Get the round numbers of races already run in a season"""
+        if year in self._completed_rounds_cache:
+            return self._completed_rounds_cache[year]
+
+        race_schedule = self.get_race_schedule(year)
+        if race_schedule is None:
+            return None
+
+        if now_ts is None:
+            now_ts = pd.Timestamp.now()
+        # Testing events are listed as round 0 and have no race session
+        completed = (race_schedule['EventDate'] < now_ts) & (
+            race_schedule['RoundNumber'] > 0)
+        completed_rounds = race_schedule.loc[completed, 'RoundNumber'].to_numpy()
+
+        # Only past seasons are final, the current one gains rounds over time
+        if year < self.current_year:
+            self._completed_rounds_cache[year] = completed_rounds
+        return completed_rounds
+
+    def _completed_rounds_by_year(self, years):
+        """Get completed rounds for several seasons, fetching their schedules concurrently"""
+        years = list(years)
+        now_ts = pd.Timestamp.now()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [executor.submit(self._completed_rounds, year, now_ts)
+                       for year in years]
+
+        season_rounds = {}
+        for year, future in zip(years, futures):
+            try:
+                completed_rounds = future.result()
+            except Exception as e:
+                print(f"Error processing year {year}: {e}")
+                continue
+            if completed_rounds is not None:
+                season_rounds[year] = completed_rounds
+        return season_rounds
+
+    def refresh_season(self, year=None):
+        """Drop cached data for a season so it is loaded again"""
+        year = year or self.current_year
+
+        # Results tier on disk
+        cached_files = glob.glob(os.path.join(
+            results_cache_dir, f"results_{year}_*.pkl"))
+        for path in cached_files:
+            os.remove(path)
+
+        # In-process caches
+        _load_schedule.cache_clear()
+        _cached_results.cache_clear()
+        self._completed_rounds_cache.pop(year, None)
+        for key in [key for key in self._session_cache if key[0] == year]:
+            del self._session_cache[key]
+
+        print(f"Cleared {len(cached_files)} cached race results for {year}")
+
     def display_race_schedule(self, year=None):
         """Display the F1 race schedule in a formatted table"""
+        from tabulate import tabulate
+
         race_schedule = self.get_race_schedule(year)
         if race_schedule is not None:
             # Display key schedule information
@@ -54,8 +330,8 @@ class F1Dashboard:
 
             # Show upcoming race
             try:
-                upcoming = race_schedule[race_schedule['EventDate'] > pd.Timestamp(
-                    datetime.now())].head(1)
+                upcoming = race_schedule[race_schedule['EventDate']
+                                         > pd.Timestamp.now()].head(1)
                 if not upcoming.empty:
                     print("\n=== Next Upcoming Race ===\n")
                     print(tabulate(upcoming[['Country', 'Location', 'EventName', 'EventDate']],
@@ -67,18 +343,29 @@ class F1Dashboard:
 
     def get_race_results(self, year, race_round):
         """Get race results for a specific race"""
+        key = (year, race_round)
+        if key in self._session_cache:
+            return self._session_cache[key]
+
         try:
             session = fastf1.get_session(year, race_round, 'R')
-            session.load()
+            # Summaries and plots need results and laps, not telemetry or weather
+            session.load(telemetry=False, weather=False)
+
+            # Evict the oldest session once the cache is full
+            if len(self._session_cache) >= SESSION_CACHE_SIZE:
+                del self._session_cache[next(iter(self._session_cache))]
+            self._session_cache[key] = session
             return session
         except Exception as e:
             print(
                 f"Error getting race results for {year} round {race_round}: {e}")
             return None
 
-    def display_race_results(self, year, race_round):
+    def display_race_results(self, year, race_round, session=None):
         """Display race results with points"""
-        session = self.get_race_results(year, race_round)
+        if session is None:
+            session = self.get_race_results(year, race_round)
         if session is not None:
             results = session.results.loc[:, ['DriverNumber', 'Abbreviation', 'FullName',
                                               'TeamName', 'Position', 'ClassifiedPosition',
@@ -91,11 +378,11 @@ class F1Dashboard:
 
             print(
                 f"\n=== Race Results: {year} Round {race_round} ({session.event['EventName']}) ===\n")
-            print(tabulate(results, headers='keys', tablefmt='grid'))
+            print_table(results)
 
             # Save results to CSV
             csv_filename = f"race{race_round}_results_{year}.csv"
-            results.to_csv(csv_filename, index=False)
+            save_csv(results, csv_filename)
             print(f"\nResults saved to {csv_filename}")
 
             return results
@@ -103,28 +390,42 @@ class F1Dashboard:
     def plot_driver_points(self, results, year, race_round):
         """Plot driver points for a race"""
         if results is not None:
-            plt.figure(figsize=(12, 6))
+            # matplotlib is slow to import, so only load it when plotting.
+            # Charts are saved as PNG files, so default to the non-interactive
+            # Agg backend unless one was picked explicitly through MPLBACKEND
+            import matplotlib
+            if 'MPLBACKEND' not in os.environ:
+                matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+
+            # Closing a chart window discards its figure, so make a new one
+            if self._fig is None or not plt.fignum_exists(self._fig.number):
+                self._fig, self._ax = plt.subplots(figsize=(12, 6))
+            self._ax.clear()
 
             # Sort by points in descending order
             results_sorted = results.sort_values(by='Points', ascending=False)
 
             # Create bar chart
-            plt.bar(results_sorted['Abbreviation'], results_sorted['Points'])
-            plt.title(f"Driver Points for Race {race_round} ({year})")
-            plt.xlabel("Driver")
-            plt.ylabel("Points")
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-
-            # Save and show plot
+            self._ax.bar(results_sorted['Abbreviation'],
+                         results_sorted['Points'])
+            self._ax.set_title(f"Driver Points for Race {race_round} ({year})")
+            self._ax.set_xlabel("Driver")
+            self._ax.set_ylabel("Points")
+            self._ax.tick_params(axis='x', labelrotation=45)
+            self._fig.tight_layout()
+
+            # Save plot, only show it when an interactive backend is in use
             plot_filename = f"race{race_round}_points_{year}.png"
-            plt.savefig(plot_filename)
-            plt.show()
+            self._fig.savefig(plot_filename)
+            if matplotlib.get_backend().lower() != 'agg':
+                plt.show()
             print(f"\nPoints chart saved to {plot_filename}")
 
-    def get_fastest_lap(self, year, race_round):
+    def get_fastest_lap(self, year, race_round, session=None):
         """Get fastest lap information for a race"""
-        session = self.get_race_results(year, race_round)
+        if session is None:
+            session = self.get_race_results(year, race_round)
         if session is not None:
             try:
                 fastest = session.laps.pick_fastest()
@@ -142,85 +443,35 @@ class F1Dashboard:
 
     def count_podiums(self, year):
         """Count podiums for each driver in a season"""
-        podium_counts = {}
-
-        race_schedule = self.get_race_schedule(year)
-        if race_schedule is None:
+        season = self._load_seasons([year]).get(year)
+        if season is None:
             return
 
-        # Get completed races
-        completed_rounds = race_schedule[race_schedule['EventDate'] < pd.Timestamp(
-            datetime.now())]['RoundNumber'].tolist()
-
         print(f"\n=== Podium Counts for {year} Season ===\n")
 
-        for round_num in completed_rounds:
-            try:
-                session = fastf1.get_session(year, round_num, 'R')
-                session.load()
-
-                # Extract top 3 finishers
-                podium_drivers = session.results.sort_values(
-                    'Position').head(3)['Abbreviation'].tolist()
-
-                # Update podium counts
-                for driver in podium_drivers:
-                    if driver in podium_counts:
-                        podium_counts[driver] += 1
-                    else:
-                        podium_counts[driver] = 1
-
-            except Exception as e:
-                print(f"Error processing round {round_num}: {e}")
-                continue
+        # Count top 3 finishes across the whole season at once
+        podium_df = season.loc[season['Position'] <= 3, 'Abbreviation'].value_counts(
+        ).rename_axis('Driver').reset_index(name='Podiums')
 
         # Display podium counts
-        sorted_counts = sorted(podium_counts.items(),
-                               key=lambda x: x[1], reverse=True)
-        podium_df = pd.DataFrame(sorted_counts, columns=['Driver', 'Podiums'])
-        print(tabulate(podium_df, headers='keys', tablefmt='grid'))
+        print_table(podium_df)
 
         return podium_df
 
     def count_dnfs(self, year):
         """Count DNFs for each driver in a season"""
-        dnf_counts = {}
-
-        race_schedule = self.get_race_schedule(year)
-        if race_schedule is None:
+        season = self._load_seasons([year]).get(year)
+        if season is None:
             return
 
-        # Get completed races
-        completed_rounds = race_schedule[race_schedule['EventDate'] < pd.Timestamp(
-            datetime.now())]['RoundNumber'].tolist()
-
         print(f"\n=== DNF Counts for {year} Season ===\n")
 
-        for round_num in completed_rounds:
-            try:
-                session = fastf1.get_session(year, round_num, 'R')
-                session.load()
-
-                # Extract DNF drivers (those with non-finished status)
-                dnf_drivers = session.results[~session.results['Status'].isin(
-                    ['Finished'])]['Abbreviation'].tolist()
-
-                # Update DNF counts
-                for driver in dnf_drivers:
-                    if driver in dnf_counts:
-                        dnf_counts[driver] += 1
-                    else:
-                        dnf_counts[driver] = 1
-
-            except Exception as e:
-                print(f"Error processing round {round_num}: {e}")
-                continue
+        # Count non-finishes across the whole season at once
+        dnf_df = season.loc[~season['_finished'], 'Abbreviation'].value_counts(
+        ).rename_axis('Driver').reset_index(name='DNFs')
 
         # Display DNF counts
-        sorted_counts = sorted(
-            dnf_counts.items(), key=lambda x: x[1], reverse=True)
-        dnf_df = pd.DataFrame(sorted_counts, columns=['Driver', 'DNFs'])
-        print(tabulate(dnf_df, headers='keys', tablefmt='grid'))
+        print_table(dnf_df)
 
         return dnf_df
 
@@ -228,70 +479,41 @@ class F1Dashboard:
         """Compare performance of two drivers across seasons"""
         print(f"\n=== Driver Comparison: {driver1} vs {driver2} ===\n")
 
-        comparison_data = []
-
-        for year in years:
-            try:
-                # Get season results for both drivers
-                driver1_points = 0
-                driver2_points = 0
-                driver1_wins = 0
-                driver2_wins = 0
-
-                race_schedule = self.get_race_schedule(year)
-                if race_schedule is None:
-                    continue
-
-                # Get completed races
-                completed_rounds = race_schedule[race_schedule['EventDate'] < pd.Timestamp(
-                    datetime.now())]['RoundNumber'].tolist()
-
-                for round_num in completed_rounds:
-                    try:
-                        session = fastf1.get_session(year, round_num, 'R')
-                        session.load()
-
-                        # Get results for both drivers
-                        driver1_result = session.results[session.results['Abbreviation'] == driver1]
-                        driver2_result = session.results[session.results['Abbreviation'] == driver2]
-
-                        # Add points
-                        if not driver1_result.empty:
-                            driver1_points += driver1_result['Points'].values[0]
-                            if driver1_result['Position'].values[0] == 1:
-                                driver1_wins += 1
-
-                        if not driver2_result.empty:
-                            driver2_points += driver2_result['Points'].values[0]
-                            if driver2_result['Position'].values[0] == 1:
-                                driver2_wins += 1
-
-                    except Exception as e:
-                        print(f"Error processing round {round_num}: {e}")
-                        continue
-
-                # Add season data to comparison
-                comparison_data.append({
-                    'Year': year,
-                    f'{driver1} Points': driver1_points,
-                    f'{driver2} Points': driver2_points,
-                    f'{driver1} Wins': driver1_wins,
-                    f'{driver2} Wins': driver2_wins
-                })
-
-            except Exception as e:
-                print(f"Error processing year {year}: {e}")
-                continue
+        # Keep only the two drivers being compared from every season
+        seasons = self._load_seasons(years)
+        frames = [season.loc[season['Abbreviation'].isin([driver1, driver2]),
+                             ['Abbreviation', 'Points', 'Position']].assign(Year=year)
+                  for year, season in seasons.items()]
+
+        # Total points and wins per season and driver
+        columns = pd.MultiIndex.from_product(
+            [['Points', 'Wins'], [driver1, driver2]])
+        season_results = pd.concat(
+            frames, ignore_index=True) if frames else pd.DataFrame()
+        if not season_results.empty:
+            season_results['Win'] = season_results['Position'].eq(1)
+            totals = season_results.groupby(['Year', 'Abbreviation']).agg(
+                Points=('Points', 'sum'), Wins=('Win', 'sum')).unstack()
+        else:
+            totals = pd.DataFrame(columns=columns)
+
+        # Seasons where a driver did not race count as zero
+        totals = totals.reindex(index=list(seasons), columns=columns).fillna(0)
+        totals.columns = [f'{driver} {stat}' for stat, driver in totals.columns]
+        comparison_df = totals.rename_axis('Year').reset_index()
+        for driver in (driver1, driver2):
+            comparison_df[f'{driver} Wins'] = comparison_df[f'{driver} Wins'].astype(
+                int)
 
         # Display comparison
-        comparison_df = pd.DataFrame(comparison_data)
-        print(tabulate(comparison_df, headers='keys', tablefmt='grid'))
+        print_table(comparison_df)
 
         return comparison_df
 
-    def grand_prix_summary(self, year, race_round):
+    def grand_prix_summary(self, year, race_round, session=None):
         """Generate a comprehensive summary of a Grand Prix"""
-        session = self.get_race_results(year, race_round)
+        if session is None:
+            session = self.get_race_results(year, race_round)
         if session is None:
             return
 
@@ -306,7 +528,7 @@ class F1Dashboard:
 
         # Winner
         try:
-            winner = session.results.sort_values('Position').iloc[0]
+            winner = session.results.loc[session.results['Position'].idxmin()]
             print(
                 f"\nWinner: {winner['FullName']} ({winner['Abbreviation']}) - {winner['TeamName']}")
             print(f"Time: {winner['Time']}")
@@ -315,11 +537,11 @@ class F1Dashboard:
 
         # Podium
         try:
-            podium = session.results.sort_values('Position').head(3)
+            podium = session.results.nsmallest(3, 'Position')
             print("\nPodium:")
-            for i, (_, driver) in enumerate(podium.iterrows()):
+            for i, driver in enumerate(podium.itertuples(index=False)):
                 print(
-                    f"{i+1}. {driver['FullName']} ({driver['Abbreviation']}) - {driver['TeamName']}")
+                    f"{i+1}. {driver.FullName} ({driver.Abbreviation}) - {driver.TeamName}")
         except Exception as e:
             print(f"Error getting podium info: {e}")
 
@@ -337,20 +559,20 @@ class F1Dashboard:
             team_points = session.results.groupby(
                 'TeamName')['Points'].sum().sort_values(ascending=False)
             print("\nTeam Points in this Race:")
-            print(tabulate(pd.DataFrame(team_points).reset_index(),
-                  headers=['Team', 'Points'], tablefmt='simple'))
+            print_table(pd.DataFrame(team_points).reset_index(),
+                        headers=['Team', 'Points'], tablefmt='simple')
         except Exception as e:
             print(f"Error getting team points: {e}")
 
         # Notable retirements
         try:
-            retirements = session.results[session.results['Status']
-                                          != 'Finished']
+            finished = _finished(session.results['Status'])
+            retirements = session.results[~finished]
             if not retirements.empty:
                 print("\nRetirements:")
-                for _, driver in retirements.iterrows():
-                    print(
-                        f"- {driver['FullName']} ({driver['Abbreviation']}) - {driver['Status']}")
+                lines = ('- ' + retirements['FullName'] + ' (' + retirements['Abbreviation']
+                         + ') - ' + retirements['Status']).tolist()
+                print('\n'.join(lines))
         except Exception as e:
             print(f"Error getting retirement info: {e}")
 
@@ -359,85 +581,52 @@ class F1Dashboard:
 
     def export_full_season_details(self, year):
         """Export full details for a season to CSV"""
-        race_schedule = self.get_race_schedule(year)
-        if race_schedule is None:
+        season = self._load_seasons([year]).get(year)
+        if season is None:
             return
 
         print(f"\n=== Exporting Full Season Details for {year} ===\n")
 
-        # Initialize data structures
-        all_results = []
-        driver_points = {}
-        team_points = {}
-
-        # Get completed races
-        completed_rounds = race_schedule[race_schedule['EventDate'] < pd.Timestamp(
-            datetime.now())]['RoundNumber'].tolist()
+        if season.empty:
+            print(f"No completed races found for {year}")
+            return
 
-        # Process each race
-        for round_num in completed_rounds:
-            try:
-                print(f"Processing round {round_num}...")
-                session = fastf1.get_session(year, round_num, 'R')
-                session.load()
-
-                race_name = session.event['EventName']
-
-                # Process each driver's result
-                for _, result in session.results.iterrows():
-                    driver = result['Abbreviation']
-                    team = result['TeamName']
-                    points = result['Points']
-
-                    # Update season points
-                    if driver not in driver_points:
-                        driver_points[driver] = 0
-                    driver_points[driver] += points
-
-                    if team not in team_points:
-                        team_points[team] = 0
-                    team_points[team] += points
-
-                    # Add to all results
-                    all_results.append({
-                        'Round': round_num,
-                        'Race': race_name,
-                        'Driver': driver,
-                        'FullName': result['FullName'],
-                        'Team': team,
-                        'Position': result['Position'],
-                        'Points': points,
-                        'Status': result['Status'],
-                        'CumulativePoints': driver_points[driver]
-                    })
+        # Race names come from the cached schedule, testing events share round 0
+        schedule = self.get_race_schedule(year)
+        race_names = schedule[schedule['RoundNumber'] > 0].set_index(
+            'RoundNumber')['EventName']
+        season_results = season.assign(Race=season['Round'].map(race_names))
 
-            except Exception as e:
-                print(f"Error processing round {round_num}: {e}")
-                continue
+        # Seasons are ordered by round, so cumulative points add up
+        columns = ['Round', 'Race', 'Abbreviation', 'FullName',
+                   'TeamName', 'Position', 'Points', 'Status']
+        results_df = season_results[columns].rename(
+            columns={'Abbreviation': 'Driver', 'TeamName': 'Team'})
+        results_df = results_df.assign(
+            CumulativePoints=results_df.groupby('Driver')['Points'].cumsum())
 
         # Create and save results DataFrame
-        results_df = pd.DataFrame(all_results)
         results_filename = f"full_season_{year}_results.csv"
-        results_df.to_csv(results_filename, index=False)
+        save_csv(results_df, results_filename)
         print(f"Full season results saved to {results_filename}")
 
         # Create and save driver standings
-        driver_standings = pd.DataFrame(sorted(driver_points.items(), key=lambda x: x[1], reverse=True),
-                                        columns=['Driver', 'Points'])
+        driver_standings = results_df.groupby('Driver', as_index=False)['Points'].sum(
+        ).sort_values('Points', ascending=False, ignore_index=True)
         driver_filename = f"driver_standings_{year}.csv"
-        driver_standings.to_csv(driver_filename, index=False)
+        save_csv(driver_standings, driver_filename)
         print(f"Driver standings saved to {driver_filename}")
 
         # Create and save team standings
-        team_standings = pd.DataFrame(sorted(team_points.items(), key=lambda x: x[1], reverse=True),
-                                      columns=['Team', 'Points'])
+        team_standings = results_df.groupby('Team', as_index=False)['Points'].sum(
+        ).sort_values('Points', ascending=False, ignore_index=True)
         team_filename = f"team_standings_{year}.csv"
-        team_standings.to_csv(team_filename, index=False)
+        save_csv(team_standings, team_filename)
         print(f"Team standings saved to {team_filename}")
 
         return results_df, driver_standings, team_standings
 
-    def export_all_time_race_data(self, start_year, end_year=None):
+    def export_all_time_race_data(self, start_year, end_year=None, resume=False):
         """Export race data from first race to current"""
         end_year = end_year or self.current_year
 
@@ -445,71 +634,71 @@ class F1Dashboard:
             f"\n=== Exporting All Race Data from {start_year} to {end_year} ===\n")
         print("This may take a while depending on the date range...")
 
-        # Initialize data structures
-        all_races = []
-
-        # Process each year
-        for year in range(start_year, end_year + 1):
-            try:
-                print(f"Processing year {year}...")
-                race_schedule = self.get_race_schedule(year)
-                if race_schedule is None:
-                    continue
-
-                # Get completed races for this year
-                completed_rounds = race_schedule[race_schedule['EventDate'] < pd.Timestamp(
-                    datetime.now())]['RoundNumber'].tolist()
-
-                # Process each race
-                for round_num in completed_rounds:
+        columns = ['Year', 'Round', 'Name', 'Date', 'Circuit', 'Country',
+                   'Winner', 'WinningTeam', 'FastestLapDriver', 'FastestLapTime']
+        filename = f"all_f1_races_{start_year}_to_{end_year}.csv"
+        partial_filename = f"{filename}.partial"
+
+        # Pick up races written by an interrupted run of the same export
+        exported = set()
+        resume = resume and os.path.exists(partial_filename)
+        if resume:
+            # A killed run can leave its last row cut short, so only complete
+            # rows are copied over before new races are appended
+            tmp_filename = f"{partial_filename}.tmp"
+            with open(partial_filename, newline='') as partial, \
+                    open(tmp_filename, 'w', newline='') as tmp:
+                writer = csv.writer(tmp)
+                writer.writerow(columns)
+                for line in partial:
+                    row = next(csv.reader([line]))
+                    if not line.endswith('\n') or len(row) != len(columns):
+                        continue
                     try:
-                        session = fastf1.get_session(year, round_num, 'R')
-                        session.load()
-
-                        # Basic race info
-                        race_info = {
-                            'Year': year,
-                            'Round': round_num,
-                            'Name': session.event['EventName'],
-                            'Date': session.event['EventDate'],
-                            'Circuit': session.event['CircuitName'],
-                            'Country': session.event['Country']
-                        }
-
-                        # Winner info
-                        winner = session.results.sort_values(
-                            'Position').iloc[0]
-                        race_info['Winner'] = winner['FullName']
-                        race_info['WinningTeam'] = winner['TeamName']
-
-                        # Fastest lap
-                        try:
-                            fastest = session.laps.pick_fastest()
-                            race_info['FastestLapDriver'] = fastest['Driver']
-                            race_info['FastestLapTime'] = str(
-                                fastest['LapTime'])
-                        except:
-                            race_info['FastestLapDriver'] = 'N/A'
-                            race_info['FastestLapTime'] = 'N/A'
-
-                        all_races.append(race_info)
-
-                    except Exception as e:
-                        print(
-                            f"Error processing {year} round {round_num}: {e}")
+                        race = (int(row[0]), int(row[1]))
+                    except ValueError:
                         continue
+                    writer.writerow(row)
+                    exported.add(race)
+            os.replace(tmp_filename, partial_filename)
+            print(f"Resuming export, {len(exported)} races already done")
+
+        # Collect completed rounds for every year first
+        print(f"Fetching schedules for {end_year - start_year + 1} seasons...")
+        season_rounds = self._completed_rounds_by_year(
+            range(start_year, end_year + 1))
+        year_rounds = [(year, int(round_num)) for year, completed_rounds in season_rounds.items()
+                       for round_num in completed_rounds
+                       if (year, int(round_num)) not in exported]
+
+        # Load and summarize races across all CPU cores, writing each race
+        # as it arrives so memory stays flat and an interrupted export keeps
+        # every finished race
+        years = [year for year, _ in year_rounds]
+        rounds = [round_num for _, round_num in year_rounds]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor, \
+                open(partial_filename, 'a' if resume else 'w', newline='') as partial:
+            writer = csv.writer(partial)
+            if not resume:
+                writer.writerow(columns)
+            current_year = None
+            for year, race_info in zip(years, executor.map(
+                    _summarize_race, years, rounds, chunksize=8)):
+                # Races come back in order, so report each year as it starts
+                if year != current_year:
+                    current_year = year
+                    print(f"Processing year {year}...")
+                if race_info is None:
+                    continue
+                writer.writerow(race_info)
+                partial.flush()
 
-            except Exception as e:
-                print(f"Error processing year {year}: {e}")
-                continue
-
-        # Create and save all-time race data
-        races_df = pd.DataFrame(all_races)
-        filename = f"all_f1_races_{start_year}_to_{end_year}.csv"
-        races_df.to_csv(filename, index=False)
+        # Races are in schedule order, except that a resumed export appends
+        # races which failed in the earlier run at the end
+        os.replace(partial_filename, filename)
         print(f"\nAll race data saved to {filename}")
 
-        return races_df
+        return filename
 
 
 def display_intro():
@@ -537,20 +726,35 @@ def display_menu():
     print("-" * 50)
 
 
-def get_valid_input(prompt, valid_range=None):
+def display_cache_info(dashboard):
+    """Display hit rates of the in-process caches"""
+    print("\n=== Cache Statistics ===\n")
+    print(f"Schedules: {_load_schedule.cache_info()}")
+    print(f"Race results: {_cached_results.cache_info()}")
+    print(f"Loaded sessions: {len(dashboard._session_cache)}")
+
+
+def get_valid_input(prompt, valid_range=None, allow_empty=False):
     """Get valid input from user with validation"""
     while True:
-        try:
-            value = input(prompt)
-            if valid_range is None:
-                return value
-            value = int(value)
-            if valid_range[0] <= value <= valid_range[1]:
-                return value
-            print(
-                f"Please enter a number between {valid_range[0]} and {valid_range[1]}")
-        except ValueError:
+        value = input(prompt)
+        if valid_range is None:
+            return value
+
+        # Check the text before converting to avoid raising on every typo
+        value = value.strip()
+        if allow_empty and not value:
+            return None
+        digits = value[1:] if value.startswith('-') else value
+        if not digits.isdecimal():
             print("Please enter a valid number")
+            continue
+
+        value = int(value)
+        if valid_range[0] <= value <= valid_range[1]:
+            return value
+        print(
+            f"Please enter a number between {valid_range[0]} and {valid_range[1]}")
 
 
 def interactive_menu():
@@ -596,15 +800,21 @@ def interactive_menu():
                 race_round = get_valid_input(
                     "Enter race round number: ", (1, 30))
 
-                if subchoice == 1:
-                    results = dashboard.display_race_results(year, race_round)
+                # Load the race once and share it across the chosen analysis
+                session = dashboard.get_race_results(year, race_round)
+
+                if session is None:
+                    print("Race data unavailable, returning to menu")
+                elif subchoice == 1:
+                    results = dashboard.display_race_results(
+                        year, race_round, session)
                     plot = get_valid_input("Generate points plot? (y/n): ")
                     if plot.lower() == 'y':
                         dashboard.plot_driver_points(results, year, race_round)
                 elif subchoice == 2:
-                    dashboard.get_fastest_lap(year, race_round)
+                    dashboard.get_fastest_lap(year, race_round, session)
                 elif subchoice == 3:
-                    dashboard.grand_prix_summary(year, race_round)
+                    dashboard.grand_prix_summary(year, race_round, session)
 
         elif choice == 3:
             print("\nDRIVER STATISTICS")
@@ -621,7 +831,7 @@ def interactive_menu():
                 podium_data = dashboard.count_podiums(year)
                 save = get_valid_input("Save to CSV? (y/n): ")
                 if save.lower() == 'y' and podium_data is not None:
-                    podium_data.to_csv(f"podiums_{year}.csv", index=False)
+                    save_csv(podium_data, f"podiums_{year}.csv")
                     print(f"Saved to podiums_{year}.csv")
 
             elif subchoice == 2:
@@ -630,7 +840,7 @@ def interactive_menu():
                 dnf_data = dashboard.count_dnfs(year)
                 save = get_valid_input("Save to CSV? (y/n): ")
                 if save.lower() == 'y' and dnf_data is not None:
-                    dnf_data.to_csv(f"dnfs_{year}.csv", index=False)
+                    save_csv(dnf_data, f"dnfs_{year}.csv")
                     print(f"Saved to dnfs_{year}.csv")
 
             elif subchoice == 3:
@@ -646,8 +856,8 @@ def interactive_menu():
                     driver1.upper(), driver2.upper(), range(start_year, end_year + 1))
                 save = get_valid_input("Save to CSV? (y/n): ")
                 if save.lower() == 'y' and comparison is not None:
-                    comparison.to_csv(
-                        f"comparison_{driver1}_{driver2}_{start_year}_{end_year}.csv", index=False)
+                    save_csv(
+                        comparison, f"comparison_{driver1}_{driver2}_{start_year}_{end_year}.csv")
                     print(
                         f"Saved to comparison_{driver1}_{driver2}_{start_year}_{end_year}.csv")
 
@@ -695,18 +905,15 @@ def interactive_menu():
                 start_year = get_valid_input(
                     "Enter start year (1950-2025): ", (1950, 2025))
                 end_year = get_valid_input(
-                    "Enter end year (or press Enter for current year): ")
-                if end_year:
-                    end_year = int(end_year)
-                else:
-                    end_year = None
+                    "Enter end year (1950-2025, or press Enter for current year): ",
+                    (1950, 2025), allow_empty=True)
                 dashboard.export_all_time_race_data(start_year, end_year)
 
         # Pause before showing menu again
         input("\nPress Enter to continue...")
 
 
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(description="F1 Statistics Dashboard")
     parser.add_argument("--menu", action="store_true",
                         help="Start interactive menu")
@@ -728,62 +935,120 @@ def main():
                         help="Export full season details to CSV (e.g. --export-season 2023)")
     parser.add_argument("--export-history", type=int, nargs=2, metavar=('START_YEAR', 'END_YEAR'),
                         help="Export race data for a date range (e.g. --export-history 2010 2023)")
+    parser.add_argument("--sync", type=int, nargs=2, metavar=('START_YEAR', 'END_YEAR'),
+                        help="Store race results locally for a range of seasons (e.g. --sync 2010 2023)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --export-history run")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Clear cached results for the current season before running")
+    parser.add_argument("--script", metavar='FILE',
+                        help="Run commands from FILE, one per line, reusing loaded data between them")
+    parser.add_argument("--debug-cache", action="store_true",
+                        help="Print in-process cache statistics after running")
+    return parser
+
+
+def _compare(dashboard, args):
+    driver1, driver2, start_year, end_year = args.compare
+    years = range(int(start_year), int(end_year) + 1)
+    dashboard.compare_drivers(driver1, driver2, years)
+
+
+# Commands in priority order, only the first one given on a line is run
+DISPATCH = [
+    ('schedule', lambda dashboard, args: dashboard.display_race_schedule(args.schedule)),
+    ('results', lambda dashboard, args: dashboard.plot_driver_points(
+        dashboard.display_race_results(*args.results), *args.results)),
+    ('fastest', lambda dashboard, args: dashboard.get_fastest_lap(*args.fastest)),
+    ('podiums', lambda dashboard, args: dashboard.count_podiums(args.podiums)),
+    ('dnfs', lambda dashboard, args: dashboard.count_dnfs(args.dnfs)),
+    ('compare', _compare),
+    ('summary', lambda dashboard, args: dashboard.grand_prix_summary(*args.summary)),
+    ('export_season', lambda dashboard, args: dashboard.export_full_season_details(args.export_season)),
+    ('export_history', lambda dashboard, args: dashboard.export_all_time_race_data(
+        *args.export_history, resume=args.resume)),
+    ('sync', lambda dashboard, args: dashboard.sync_local_store(*args.sync)),
+]
+
+
+def run_command(dashboard, args):
+    """Run the command selected in args, returning False if none was given"""
+    for name, command in DISPATCH:
+        if getattr(args, name) is not None:
+            command(dashboard, args)
+            return True
+    return False
+
+
+def parse_args(parser, argv=None):
+    """Parse command-line arguments, checking values argparse cannot type itself"""
+    args = parser.parse_args(argv)
+    if args.compare is not None:
+        for year in args.compare[2:]:
+            if not year.isdecimal():
+                parser.error(f"--compare years must be numbers, got '{year}'")
+    return args
+
+
+def run_script(dashboard, parser, path):
+    """Run each command line in a script file against the same dashboard"""
+    try:
+        with open(path) as f:
+            lines = [line.strip() for line in f]
+    except OSError as e:
+        parser.error(f"cannot read script {path}: {e}")
+
+    # Parse every line up front so a typo fails before any slow loading starts
+    commands = [(line, parse_args(parser, shlex.split(line)))
+                for line in lines if line and not line.startswith('#')]
+
+    # These options apply to the whole run, so they only work on the command line
+    for line, args in commands:
+        for name in ('menu', 'script', 'refresh', 'debug_cache'):
+            if getattr(args, name):
+                option = '--' + name.replace('_', '-')
+                parser.error(f"{option} cannot be used in a script line: {line}")
 
-    args = parser.parse_args()
+    for line, args in commands:
+        if not run_command(dashboard, args):
+            print(f"No command given in script line: {line}")
+
+
+def main():
+    parser = build_parser()
+    args = parse_args(parser)
 
     dashboard = F1Dashboard()
 
+    # Past seasons never change, only the current one needs refreshing
+    if args.refresh:
+        dashboard.refresh_season()
+
     # If no arguments provided or --menu specified, run interactive menu
     if len(sys.argv) == 1 or args.menu:
         interactive_menu()
         return
 
     # Execute the requested action
-    if args.schedule is not None:
-        dashboard.display_race_schedule(args.schedule)
-
-    elif args.results is not None:
-        year, race_round = args.results
-        results = dashboard.display_race_results(year, race_round)
-        dashboard.plot_driver_points(results, year, race_round)
-
-    elif args.fastest is not None:
-        year, race_round = args.fastest
-        dashboard.get_fastest_lap(year, race_round)
+    if args.script is not None:
+        run_script(dashboard, parser, args.script)
 
-    elif args.podiums is not None:
-        dashboard.count_podiums(args.podiums)
-
-    elif args.dnfs is not None:
-        dashboard.count_dnfs(args.dnfs)
-
-    elif args.compare is not None:
-        driver1, driver2, start_year, end_year = args.compare
-        years = range(int(start_year), int(end_year) + 1)
-        dashboard.compare_drivers(driver1, driver2, years)
-
-    elif args.summary is not None:
-        year, race_round = args.summary
-        dashboard.grand_prix_summary(year, race_round)
-
-    elif args.export_season is not None:
-        dashboard.export_full_season_details(args.export_season)
-
-    elif args.export_history is not None:
-        start_year, end_year = args.export_history
-        dashboard.export_all_time_race_data(start_year, end_year)
-
-    else:
+    elif not run_command(dashboard, args):
         # Default: display current season schedule
         print("Use --menu for interactive mode or --help to see available commands")
         dashboard.display_race_schedule()
 
+    if args.debug_cache:
+        display_cache_info(dashboard)
+
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
         print("\n\nProgram terminated by user. Goodbye!")
-    except Exception as e:
-        print(f"\nAn error occurred: {e}")
-        print("If this is related to data access, please check your internet connection.")
+    except requests.RequestException as e:
+        print(f"\nA network error occurred: {e}")
+        print("Please check your internet connection. Interrupted history exports "
+              "can be continued with --resume.")
+        sys.exit(1)